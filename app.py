@@ -1,47 +1,196 @@
+# Patch blocking I/O before anything imports socket/ssl so outbound
+# scraper requests yield cooperatively under gevent
+from gevent import monkey
+monkey.patch_all()
+
+import atexit
 import logging
-import time
-from datetime import datetime
-from flask import Flask, request, jsonify
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+import gevent
+import orjson
+from types import MappingProxyType
+from gevent.pool import Pool
+from flask import Flask, Response, request
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
 
 # Import configuration and scrapers
 from config import Config
 from scrapers.url_scraper import URLScraper
 from scrapers.text_scraper import TextScraper
-from auth import require_api_key, optional_api_key, api_key_manager
-
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, Config.LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(Config.LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
+from scrapers.combined_scraper import CombinedScraper
+from scrapers.base import fetch_time_budget, normalize_url
+from auth import require_api_key, optional_api_key, get_manager
+from rate_limiter import TokenBucket
+from timestamps import now_iso
+from responses import OrjsonProvider, ojsonify, json_template
+
+# Configure logging: requests only enqueue records, a listener on a real OS
+# thread does the blocking file/stream writes. monkey.patch_all() turns
+# threading.Thread into a greenlet, so the stock QueueListener would still
+# write on the event loop; its thread, queue and handler locks are taken
+# from the unpatched modules instead.
+_start_native_thread = monkey.get_original('_thread', 'start_new_thread')
+_allocate_native_lock = monkey.get_original('_thread', 'allocate_lock')
+_NativeRLock = monkey.get_original('_thread', 'RLock')
+_NativeSimpleQueue = monkey.get_original('queue', 'SimpleQueue')
+
+class NativeQueueListener(QueueListener):
+    """QueueListener whose worker runs on an OS thread rather than a greenlet."""
+    
+    def start(self):
+        self._stopped = _allocate_native_lock()
+        self._stopped.acquire()
+        _start_native_thread(self._run, ())
+    
+    def _run(self):
+        try:
+            self._monitor()
+        finally:
+            self._stopped.release()
+    
+    def stop(self):
+        self.enqueue_sentinel()
+        self._stopped.acquire()
+
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+log_handlers = [logging.FileHandler(Config.LOG_FILE), logging.StreamHandler()]
+for handler in log_handlers:
+    handler.setFormatter(log_formatter)
+    handler.lock = _NativeRLock()
+
+log_queue = _NativeSimpleQueue()
+root_logger = logging.getLogger()
+root_logger.setLevel(getattr(logging, Config.LOG_LEVEL))
+root_logger.addHandler(QueueHandler(log_queue))
+log_listener = NativeQueueListener(log_queue, *log_handlers, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+# API request bodies are small JSON documents (unlike Config.MAX_CONTENT_LENGTH,
+# which limits scraped pages); larger bodies are rejected with 413
+app.config['MAX_CONTENT_LENGTH'] = 16 * 1024
 CORS(app)
 
 # Initialize scrapers
 url_scraper = URLScraper(Config)
 text_scraper = TextScraper(Config)
+combined_scraper = CombinedScraper(Config)
+
+# Load API keys at startup rather than on the first request
+api_key_manager = get_manager()
+
+# Per-client rate limiting (one token every RATE_LIMIT_DELAY seconds)
+rate_limiter = TokenBucket(
+    rate=1.0 / Config.RATE_LIMIT_DELAY if Config.RATE_LIMIT_DELAY > 0 else 0,
+    capacity=Config.RATE_LIMIT_BURST
+)
+
+# Bounded pool for outbound scrapes; each fetch runs in its own greenlet
+scrape_pool = Pool(Config.MAX_CONCURRENT_SCRAPES)
+# Long enough for every retry of a fetch, plus time to parse the page
+SCRAPE_TIMEOUT = fetch_time_budget(Config) + 2
+
+# Error response shapes for the scrape endpoints (read-only; copy before use)
+_URL_ERR_TEMPLATE = MappingProxyType({
+    'success': False,
+    'urls': [],
+    'count': 0,
+    'processing_time': 0,
+    'timestamp': '',
+    'error': ''
+})
+_TEXT_ERR_TEMPLATE = MappingProxyType({
+    'success': False,
+    'text': '',
+    'title': '',
+    'meta_description': '',
+    'headings': {},
+    'word_count': 0,
+    'character_count': 0,
+    'processing_time': 0,
+    'timestamp': '',
+    'error': ''
+})
+_ALL_ERR_TEMPLATE = MappingProxyType({**_URL_ERR_TEMPLATE, **_TEXT_ERR_TEMPLATE})
+_ERR_TEMPLATE = MappingProxyType({
+    'success': False,
+    'error': '',
+    'timestamp': ''
+})
+
+def error_response(template, error, processing_time=0):
+    """
+    Build an error payload from one of the module-level templates.
+    
+    Args:
+        template (MappingProxyType): Response shape to copy
+        error (str): Error message
+        processing_time (float): Time spent before the error
+        
+    Returns:
+        dict: Error response payload
+    """
+    payload = template.copy()
+    payload['error'] = error
+    payload['timestamp'] = now_iso()
+    if processing_time:
+        payload['processing_time'] = processing_time
+    return payload
 
 def validate_url_request(data):
     """Common URL validation for requests."""
     if not data or 'url' not in data:
         return None, 'Missing required field: url'
     
-    url = data['url'].strip()
+    # Reject malformed URLs before they cost a DNS lookup/connect
+    return normalize_url(data['url'])
+
+def check_rate_limit():
+    """
+    Apply the per-client token bucket to the current request.
     
-    if not url:
-        return None, 'URL cannot be empty'
+    Returns:
+        tuple: (rate_limited, retry_after_seconds)
+    """
+    key_info = getattr(request, 'api_key_info', None)
+    # Bucket per key digest; several keys can share a name such as env_key
+    client = key_info['key_hash'] if key_info else request.remote_addr
+    allowed, retry_after = rate_limiter.try_acquire(client)
     
-    if not url.startswith(('http://', 'https://')):
-        url = 'https://' + url
+    if not allowed:
+        logger.warning(f"Rate limit exceeded for {key_info['key_id'] if key_info else client}")
     
-    return url, None
+    return not allowed, retry_after
+
+def run_scrape(scraper, url):
+    """
+    Run a scraper on the bounded scrape pool.
+    
+    Args:
+        scraper (BaseScraper): Scraper to run
+        url (str): Validated URL to scrape
+        
+    Returns:
+        dict: Scraper result
+        
+    Raises:
+        TimeoutError: If the scrape does not finish within SCRAPE_TIMEOUT
+    """
+    job = scrape_pool.spawn(scraper.scrape, url)
+    try:
+        return job.get(timeout=SCRAPE_TIMEOUT)
+    except gevent.Timeout:
+        job.kill(block=False)
+        raise TimeoutError(f'Scrape timed out after {SCRAPE_TIMEOUT} seconds')
+
+def is_authenticated():
+    """Check whether the current request carried a valid API key."""
+    return getattr(request, 'api_key_info', None) is not None
 
 # API Routes
 
@@ -57,32 +206,26 @@ def api_scrape_urls():
         url, error = validate_url_request(data)
         
         if error:
-            return jsonify({
-                'success': False,
-                'urls': [],
-                'count': 0,
-                'processing_time': 0,
-                'timestamp': datetime.utcnow().isoformat(),
-                'error': error
-            }), 400
+            return ojsonify(error_response(_URL_ERR_TEMPLATE, error), 400)
         
         # Rate limiting
-        time.sleep(Config.RATE_LIMIT_DELAY)
+        rate_limited, retry_after = check_rate_limit()
+        if rate_limited:
+            error = f'Rate limit exceeded, retry after {retry_after} seconds'
+            return ojsonify(error_response(_URL_ERR_TEMPLATE, error), 429, headers={'Retry-After': str(retry_after)})
         
-        result = url_scraper.scrape(url)
+        result = run_scrape(url_scraper, url)
         status_code = 200 if result['success'] else 400
-        return jsonify(result), status_code
+        return ojsonify(result, status_code)
         
+    except TimeoutError as e:
+        logger.error(f"Scrape timeout: {str(e)}")
+        return ojsonify(error_response(_URL_ERR_TEMPLATE, str(e), SCRAPE_TIMEOUT), 504)
+    except RequestEntityTooLarge:
+        return ojsonify(error_response(_URL_ERR_TEMPLATE, 'Request body too large'), 413)
     except Exception as e:
         logger.error(f"Internal server error: {str(e)}")
-        return jsonify({
-            'success': False,
-            'urls': [],
-            'count': 0,
-            'processing_time': 0,
-            'timestamp': datetime.utcnow().isoformat(),
-            'error': f'Internal server error: {str(e)}'
-        }), 500
+        return ojsonify(error_response(_URL_ERR_TEMPLATE, f'Internal server error: {str(e)}'), 500)
 
 @app.route('/api/scrape/text', methods=['POST'])
 @require_api_key
@@ -96,126 +239,176 @@ def api_scrape_text():
         url, error = validate_url_request(data)
         
         if error:
-            return jsonify({
-                'success': False,
-                'text': '',
-                'title': '',
-                'meta_description': '',
-                'headings': {},
-                'word_count': 0,
-                'character_count': 0,
-                'processing_time': 0,
-                'timestamp': datetime.utcnow().isoformat(),
-                'error': error
-            }), 400
+            return ojsonify(error_response(_TEXT_ERR_TEMPLATE, error), 400)
         
         # Rate limiting
-        time.sleep(Config.RATE_LIMIT_DELAY)
+        rate_limited, retry_after = check_rate_limit()
+        if rate_limited:
+            error = f'Rate limit exceeded, retry after {retry_after} seconds'
+            return ojsonify(error_response(_TEXT_ERR_TEMPLATE, error), 429, headers={'Retry-After': str(retry_after)})
         
-        result = text_scraper.scrape(url)
+        result = run_scrape(text_scraper, url)
         status_code = 200 if result['success'] else 400
-        return jsonify(result), status_code
+        return ojsonify(result, status_code)
         
+    except TimeoutError as e:
+        logger.error(f"Scrape timeout: {str(e)}")
+        return ojsonify(error_response(_TEXT_ERR_TEMPLATE, str(e), SCRAPE_TIMEOUT), 504)
+    except RequestEntityTooLarge:
+        return ojsonify(error_response(_TEXT_ERR_TEMPLATE, 'Request body too large'), 413)
     except Exception as e:
         logger.error(f"Internal server error: {str(e)}")
-        return jsonify({
-            'success': False,
-            'text': '',
-            'title': '',
-            'meta_description': '',
-            'headings': {},
-            'word_count': 0,
-            'character_count': 0,
-            'processing_time': 0,
-            'timestamp': datetime.utcnow().isoformat(),
-            'error': f'Internal server error: {str(e)}'
-        }), 500
+        return ojsonify(error_response(_TEXT_ERR_TEMPLATE, f'Internal server error: {str(e)}'), 500)
+
+@app.route('/api/scrape/all', methods=['POST'])
+@require_api_key
+def api_scrape_all():
+    """
+    API endpoint to scrape both URLs and text content with a single fetch.
+    Requires API key authentication.
+    """
+    try:
+        data = request.get_json()
+        url, error = validate_url_request(data)
+        
+        if error:
+            return ojsonify(error_response(_ALL_ERR_TEMPLATE, error), 400)
+        
+        # Rate limiting
+        rate_limited, retry_after = check_rate_limit()
+        if rate_limited:
+            error = f'Rate limit exceeded, retry after {retry_after} seconds'
+            return ojsonify(error_response(_ALL_ERR_TEMPLATE, error), 429, headers={'Retry-After': str(retry_after)})
+        
+        result = run_scrape(combined_scraper, url)
+        status_code = 200 if result['success'] else 400
+        return ojsonify(result, status_code)
+        
+    except TimeoutError as e:
+        logger.error(f"Scrape timeout: {str(e)}")
+        return ojsonify(error_response(_ALL_ERR_TEMPLATE, str(e), SCRAPE_TIMEOUT), 504)
+    except RequestEntityTooLarge:
+        return ojsonify(error_response(_ALL_ERR_TEMPLATE, 'Request body too large'), 413)
+    except Exception as e:
+        logger.error(f"Internal server error: {str(e)}")
+        return ojsonify(error_response(_ALL_ERR_TEMPLATE, f'Internal server error: {str(e)}'), 500)
+
+_HEALTH_TEMPLATE = json_template({
+    'status': 'healthy',
+    'service': 'unified-scraper-api',
+    'timestamp': '__timestamp__',
+    'version': '1.0.0',
+    'authenticated': '__authenticated__'
+})
+
+# Bodies vary by API key, so shared caches must key on the auth headers
+_HEALTH_CACHE_HEADERS = {'Cache-Control': 'public, max-age=1', 'Vary': 'X-API-Key, Authorization'}
+_STATIC_CACHE_HEADERS = {'Cache-Control': 'public, max-age=30', 'Vary': 'X-API-Key, Authorization'}
+
+@lru_cache(maxsize=4)
+def _health_body(timestamp, authenticated):
+    """Render the health body; entries roll over with the per-second timestamp."""
+    return _HEALTH_TEMPLATE % {
+        b'timestamp': orjson.dumps(timestamp),
+        b'authenticated': b'true' if authenticated else b'false'
+    }
 
 @app.route('/health', methods=['GET'])
 @optional_api_key
-def health_check():
+def health_check(_now_iso=now_iso, _is_authenticated=is_authenticated, _body=_health_body, _Response=Response):
     """Health check endpoint (API key optional)."""
-    return jsonify({
-        'status': 'healthy',
-        'service': 'unified-scraper-api',
-        'timestamp': datetime.utcnow().isoformat(),
-        'version': '1.0.0',
-        'authenticated': hasattr(request, 'api_key_info') and request.api_key_info is not None
-    }), 200
+    # Hot names are bound as defaults so lookups are local rather than global
+    body = _body(_now_iso(), _is_authenticated())
+    return _Response(body, status=200, headers=_HEALTH_CACHE_HEADERS, mimetype='application/json')
+
+_INFO_JSON = orjson.dumps({
+    'service': 'Unified Web Scraper API',
+    'version': '1.0.0',
+    'description': 'Production-ready unified API for web scraping operations',
+    'endpoints': {
+        'POST /api/scrape/urls': 'Scrape URLs from a webpage',
+        'POST /api/scrape/text': 'Scrape text content from a webpage',
+        'POST /api/scrape/all': 'Scrape URLs and text content with a single fetch',
+        'GET /health': 'Health check',
+        'GET /api/info': 'Service information'
+    },
+    'configuration': dict(Config.to_dict()),
+    'example_usage': {
+        'url_scraping': {
+            'url': '/api/scrape/urls',
+            'method': 'POST',
+            'payload': {'url': 'https://example.com'}
+        },
+        'text_scraping': {
+            'url': '/api/scrape/text',
+            'method': 'POST',
+            'payload': {'url': 'https://example.com'}
+        }
+    }
+})
 
 @app.route('/api/info', methods=['GET'])
 @optional_api_key
-def service_info():
+def service_info(_Response=Response, _body=_INFO_JSON):
     """Service information endpoint (API key optional)."""
-    return jsonify({
-        'service': 'Unified Web Scraper API',
-        'version': '1.0.0',
-        'description': 'Production-ready unified API for web scraping operations',
-        'endpoints': {
-            'POST /api/scrape/urls': 'Scrape URLs from a webpage',
-            'POST /api/scrape/text': 'Scrape text content from a webpage',
-            'GET /health': 'Health check',
-            'GET /api/info': 'Service information'
-        },
-        'configuration': Config.to_dict(),
-        'example_usage': {
-            'url_scraping': {
-                'url': '/api/scrape/urls',
-                'method': 'POST',
-                'payload': {'url': 'https://example.com'}
-            },
-            'text_scraping': {
-                'url': '/api/scrape/text',
-                'method': 'POST',
-                'payload': {'url': 'https://example.com'}
-            }
-        }
-    }), 200
+    return _Response(_body, status=200, headers=_STATIC_CACHE_HEADERS, mimetype='application/json')
+
+_HOME_TEMPLATE = json_template({
+    'message': 'Unified Web Scraper API',
+    'version': '1.0.0',
+    'status': 'running',
+    'authentication': {
+        'required': Config.REQUIRE_API_KEY,
+        'authenticated': '__authenticated__'
+    },
+    'endpoints': {
+        'POST /api/scrape/urls': 'Scrape URLs from a webpage (requires API key)',
+        'POST /api/scrape/text': 'Scrape text content from a webpage (requires API key)',
+        'POST /api/scrape/all': 'Scrape URLs and text content in one request (requires API key)',
+        'GET /health': 'Health check',
+        'GET /api/info': 'Detailed service information',
+        'GET /api/keys': 'API key management (requires API key)'
+    }
+})
+
+@lru_cache(maxsize=2)
+def _home_body(authenticated):
+    """Render the home body once per authentication state."""
+    return _HOME_TEMPLATE % {b'authenticated': b'true' if authenticated else b'false'}
 
 @app.route('/', methods=['GET'])
 @optional_api_key
-def home():
+def home(_is_authenticated=is_authenticated, _body=_home_body, _Response=Response):
     """Home endpoint with basic info."""
-    return jsonify({
-        'message': 'Unified Web Scraper API',
-        'version': '1.0.0',
-        'status': 'running',
-        'authentication': {
-            'required': Config.REQUIRE_API_KEY,
-            'authenticated': hasattr(request, 'api_key_info') and request.api_key_info is not None
-        },
-        'endpoints': {
-            'POST /api/scrape/urls': 'Scrape URLs from a webpage (requires API key)',
-            'POST /api/scrape/text': 'Scrape text content from a webpage (requires API key)',
-            'GET /health': 'Health check',
-            'GET /api/info': 'Detailed service information',
-            'GET /api/keys': 'API key management (requires API key)'
-        }
-    }), 200
+    return _Response(_body(_is_authenticated()), status=200, headers=_STATIC_CACHE_HEADERS, mimetype='application/json')
+
+_NOT_FOUND_TEMPLATE = json_template({
+    'success': False,
+    'error': 'Endpoint not found',
+    'timestamp': '__timestamp__',
+    'available_endpoints': [
+        'POST /api/scrape/urls (requires API key)',
+        'POST /api/scrape/text (requires API key)',
+        'POST /api/scrape/all (requires API key)',
+        'GET /health',
+        'GET /api/info',
+        'GET /api/keys (requires API key)'
+    ]
+})
 
 @app.errorhandler(404)
 def not_found(error):
-    return jsonify({
-        'success': False,
-        'error': 'Endpoint not found',
-        'timestamp': datetime.utcnow().isoformat(),
-        'available_endpoints': [
-            'POST /api/scrape/urls (requires API key)',
-            'POST /api/scrape/text (requires API key)',
-            'GET /health',
-            'GET /api/info',
-            'GET /api/keys (requires API key)'
-        ]
-    }), 404
+    body = _NOT_FOUND_TEMPLATE % {b'timestamp': orjson.dumps(now_iso())}
+    return Response(body, status=404, mimetype='application/json')
+
+@app.errorhandler(413)
+def request_too_large(error):
+    return ojsonify(error_response(_ERR_TEMPLATE, 'Request body too large'), 413)
 
 @app.errorhandler(500)
 def internal_error(error):
     logger.error(f"Internal server error: {str(error)}")
-    return jsonify({
-        'success': False,
-        'error': 'Internal server error',
-        'timestamp': datetime.utcnow().isoformat()
-    }), 500
+    return ojsonify(error_response(_ERR_TEMPLATE, 'Internal server error'), 500)
 
 # API Key Management Endpoints
 @app.route('/api/keys', methods=['GET'])
@@ -223,12 +416,12 @@ def internal_error(error):
 def list_api_keys():
     """List all API keys (without showing actual keys)."""
     keys = api_key_manager.list_api_keys()
-    return jsonify({
+    return ojsonify({
         'success': True,
         'keys': keys,
         'count': len(keys),
-        'timestamp': datetime.utcnow().isoformat()
-    }), 200
+        'timestamp': now_iso()
+    }, 200)
 
 @app.route('/api/keys/generate', methods=['POST'])
 @require_api_key
@@ -239,14 +432,14 @@ def generate_api_key():
     
     new_key = api_key_manager.generate_api_key(name)
     
-    return jsonify({
+    return ojsonify({
         'success': True,
         'message': 'API key generated successfully',
         'key': new_key,
         'name': name,
-        'timestamp': datetime.utcnow().isoformat(),
+        'timestamp': now_iso(),
         'warning': 'Store this key securely. It will not be shown again.'
-    }), 201
+    }, 201)
 
 @app.route('/api/keys/revoke', methods=['POST'])
 @require_api_key
@@ -256,27 +449,32 @@ def revoke_api_key():
     key_to_revoke = data.get('key')
     
     if not key_to_revoke:
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': 'Missing required field: key',
-            'timestamp': datetime.utcnow().isoformat()
-        }), 400
+            'timestamp': now_iso()
+        }, 400)
     
     success = api_key_manager.revoke_api_key(key_to_revoke)
     
     if success:
-        return jsonify({
+        return ojsonify({
             'success': True,
             'message': 'API key revoked successfully',
-            'timestamp': datetime.utcnow().isoformat()
-        }), 200
+            'timestamp': now_iso()
+        }, 200)
     else:
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': 'API key not found',
-            'timestamp': datetime.utcnow().isoformat()
-        }), 404
+            'timestamp': now_iso()
+        }, 404)
 
 if __name__ == '__main__':
+    from gevent.pywsgi import WSGIServer
+    
     logger.info(f"Starting Unified Scraper API on {Config.HOST}:{Config.PORT}")
-    app.run(debug=Config.DEBUG, host=Config.HOST, port=Config.PORT)
\ No newline at end of file
+    if Config.DEBUG:
+        app.run(debug=True, host=Config.HOST, port=Config.PORT)
+    else:
+        WSGIServer((Config.HOST, Config.PORT), app).serve_forever()
\ No newline at end of file
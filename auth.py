@@ -2,15 +2,33 @@
 API Key authentication and management system.
 """
 import os
+import base64
 import hashlib
 import secrets
 import logging
 from functools import wraps
-from flask import request, jsonify
-from datetime import datetime
+from flask import request
+from timestamps import now_iso
+from responses import ojsonify
 
 logger = logging.getLogger(__name__)
 
+def hash_api_key(api_key):
+    """
+    Hash an API key for storage and lookup.
+    
+    Args:
+        api_key (str): Plaintext API key
+        
+    Returns:
+        bytes: SHA-256 digest of the key
+    """
+    return hashlib.sha256(api_key.encode()).digest()
+
+def _key_id(api_key):
+    """Build the masked identifier shown when listing keys."""
+    return api_key[:8] + '...' + api_key[-4:]
+
 class APIKeyManager:
     """Manages API key authentication and validation."""
     
@@ -18,8 +36,14 @@ class APIKeyManager:
         self.api_keys = self._load_api_keys()
     
     def _load_api_keys(self):
-        """Load API keys from environment variables or file."""
+        """
+        Load API keys from environment variables or file.
+        
+        Keys are indexed by their SHA-256 digest so plaintext keys are
+        never kept in memory after loading.
+        """
         api_keys = {}
+        now = now_iso()
         
         # Load from environment variable (comma-separated)
         env_keys = os.getenv('API_KEYS', '')
@@ -27,9 +51,10 @@ class APIKeyManager:
             for key in env_keys.split(','):
                 key = key.strip()
                 if key:
-                    api_keys[key] = {
+                    api_keys[hash_api_key(key)] = {
+                        'key_id': _key_id(key),
                         'name': 'env_key',
-                        'created_at': datetime.utcnow().isoformat(),
+                        'created_at': now,
                         'active': True
                     }
         
@@ -38,30 +63,44 @@ class APIKeyManager:
             keys_file = os.getenv('API_KEYS_FILE', 'api_keys.txt')
             if os.path.exists(keys_file):
                 with open(keys_file, 'r') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#'):
-                            parts = line.split('|')
-                            key = parts[0].strip()
-                            name = parts[1].strip() if len(parts) > 1 else 'file_key'
-                            api_keys[key] = {
-                                'name': name,
-                                'created_at': datetime.utcnow().isoformat(),
-                                'active': True
-                            }
+                    data = f.read()
+                
+                for line in data.splitlines():
+                    line = line.strip()
+                    if not line or line[0] == '#':
+                        continue
+                    
+                    # Format: key|name (name optional)
+                    key, _, rest = line.partition('|')
+                    key = key.rstrip()
+                    if not key:
+                        continue
+                    
+                    api_keys[hash_api_key(key)] = {
+                        'key_id': _key_id(key),
+                        'name': rest.partition('|')[0].strip() or 'file_key',
+                        'created_at': now,
+                        'active': True
+                    }
         except Exception as e:
             logger.error(f"Error loading API keys from file: {e}")
         
         # If no keys found, create a default one (for development)
         if not api_keys:
             default_key = os.getenv('DEFAULT_API_KEY', 'dev-key-12345')
-            api_keys[default_key] = {
+            api_keys[hash_api_key(default_key)] = {
+                'key_id': _key_id(default_key),
                 'name': 'default_development_key',
-                'created_at': datetime.utcnow().isoformat(),
+                'created_at': now,
                 'active': True
             }
             logger.warning(f"No API keys configured, using default key: {default_key}")
         
+        # Keep each key's digest with its info so callers can tell keys apart
+        # without the plaintext (names like env_key are shared)
+        for digest, info in api_keys.items():
+            info['key_hash'] = digest
+        
         logger.info(f"Loaded {len(api_keys)} API keys")
         return api_keys
     
@@ -78,7 +117,7 @@ class APIKeyManager:
         if not api_key:
             return None
         
-        key_info = self.api_keys.get(api_key)
+        key_info = self.api_keys.get(hash_api_key(api_key))
         if key_info and key_info.get('active', True):
             return key_info
         
@@ -94,12 +133,15 @@ class APIKeyManager:
         Returns:
             str: The generated API key
         """
-        # Generate a secure random key
-        key = f"sk-{secrets.token_urlsafe(32)}"
+        # Generate a secure random key (43 url-safe chars, padding dropped)
+        key = 'sk-' + base64.urlsafe_b64encode(secrets.token_bytes(32)).rstrip(b'=').decode()
         
-        self.api_keys[key] = {
+        digest = hash_api_key(key)
+        self.api_keys[digest] = {
+            'key_hash': digest,
+            'key_id': _key_id(key),
             'name': name,
-            'created_at': datetime.utcnow().isoformat(),
+            'created_at': now_iso(),
             'active': True
         }
         
@@ -116,9 +158,10 @@ class APIKeyManager:
         Returns:
             bool: True if revoked successfully
         """
-        if api_key in self.api_keys:
-            self.api_keys[api_key]['active'] = False
-            logger.info(f"Revoked API key: {self.api_keys[api_key]['name']}")
+        key_info = self.api_keys.get(hash_api_key(api_key)) if api_key else None
+        if key_info:
+            key_info['active'] = False
+            logger.info(f"Revoked API key: {key_info['name']}")
             return True
         
         return False
@@ -132,16 +175,48 @@ class APIKeyManager:
         """
         return [
             {
-                'key_id': key[:8] + '...' + key[-4:],
+                'key_id': info['key_id'],
                 'name': info['name'],
                 'created_at': info['created_at'],
                 'active': info['active']
             }
-            for key, info in self.api_keys.items()
+            for info in self.api_keys.values()
         ]
 
 # Global API key manager instance
-api_key_manager = APIKeyManager()
+_manager = None
+
+def get_manager():
+    """
+    Get the global API key manager, creating it on first use.
+    
+    Returns:
+        APIKeyManager: Shared manager instance
+    """
+    global _manager
+    if _manager is None:
+        _manager = APIKeyManager()
+    return _manager
+
+def _extract_key(headers):
+    """
+    Pull the API key from X-API-Key or an Authorization Bearer token.
+    
+    Args:
+        headers: Request headers
+        
+    Returns:
+        str: The API key, or None if neither header carries one
+    """
+    api_key = headers.get('X-API-Key')
+    if api_key:
+        return api_key
+    
+    auth_header = headers.get('Authorization')
+    if auth_header and len(auth_header) > 7 and auth_header[:7] == 'Bearer ':
+        return auth_header[7:]
+    
+    return None
 
 def require_api_key(f):
     """
@@ -155,28 +230,23 @@ def require_api_key(f):
     """
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        # Get API key from header
-        api_key = request.headers.get('X-API-Key')
-        
-        # Also check Authorization header (Bearer token format)
-        if not api_key:
-            auth_header = request.headers.get('Authorization')
-            if auth_header and auth_header.startswith('Bearer '):
-                api_key = auth_header[7:]  # Remove 'Bearer ' prefix
+        # Get API key from X-API-Key or Authorization: Bearer header
+        api_key = _extract_key(request.headers)
         
         # Validate API key
-        key_info = api_key_manager.validate_api_key(api_key)
+        key_info = get_manager().validate_api_key(api_key)
         if not key_info:
             logger.warning(f"Invalid API key attempt from {request.remote_addr}")
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'error': 'Invalid or missing API key',
                 'message': 'Please provide a valid API key in the X-API-Key header or Authorization header',
-                'timestamp': datetime.utcnow().isoformat()
-            }), 401
+                'timestamp': now_iso()
+            }, 401)
         
         # Log successful authentication
-        logger.info(f"API key authenticated: {key_info['name']} from {request.remote_addr}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"API key authenticated: {key_info['name']} from {request.remote_addr}")
         
         # Store key info in request context for use in endpoint
         request.api_key_info = key_info
@@ -192,27 +262,23 @@ def optional_api_key(f):
     """
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        api_key = request.headers.get('X-API-Key')
-        
-        if not api_key:
-            auth_header = request.headers.get('Authorization')
-            if auth_header and auth_header.startswith('Bearer '):
-                api_key = auth_header[7:]
+        api_key = _extract_key(request.headers)
         
         # If API key is provided, validate it
         if api_key:
-            key_info = api_key_manager.validate_api_key(api_key)
+            key_info = get_manager().validate_api_key(api_key)
             if not key_info:
                 logger.warning(f"Invalid API key attempt from {request.remote_addr}")
-                return jsonify({
+                return ojsonify({
                     'success': False,
                     'error': 'Invalid API key',
                     'message': 'The provided API key is invalid',
-                    'timestamp': datetime.utcnow().isoformat()
-                }), 401
+                    'timestamp': now_iso()
+                }, 401)
             
             request.api_key_info = key_info
-            logger.info(f"API key authenticated: {key_info['name']} from {request.remote_addr}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"API key authenticated: {key_info['name']} from {request.remote_addr}")
         else:
             request.api_key_info = None
         
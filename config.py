@@ -2,6 +2,7 @@
 Configuration management for the unified scraper API.
 """
 import os
+from types import MappingProxyType
 
 class Config:
     """Configuration class for the scraper API."""
@@ -10,6 +11,8 @@ class Config:
     REQUEST_TIMEOUT = int(os.getenv('REQUEST_TIMEOUT', 10))
     MAX_RETRIES = int(os.getenv('MAX_RETRIES', 3))
     RATE_LIMIT_DELAY = float(os.getenv('RATE_LIMIT_DELAY', 1.0))
+    RATE_LIMIT_BURST = int(os.getenv('RATE_LIMIT_BURST', 5))
+    MAX_CONCURRENT_SCRAPES = int(os.getenv('MAX_CONCURRENT_SCRAPES', 64))
     
     # Content limits
     MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', 1000000))  # 1MB
@@ -29,18 +32,25 @@ class Config:
     API_KEYS_FILE = os.getenv('API_KEYS_FILE', 'api_keys.txt')
     DEFAULT_API_KEY = os.getenv('DEFAULT_API_KEY', 'dev-key-12345')
     
+    # Read-only snapshot built on first use; values are fixed at import
+    _dict_cache = None
+    
     @classmethod
     def to_dict(cls):
-        """Convert configuration to dictionary."""
-        return {
-            'request_timeout': cls.REQUEST_TIMEOUT,
-            'max_retries': cls.MAX_RETRIES,
-            'rate_limit_delay': cls.RATE_LIMIT_DELAY,
-            'max_content_length': cls.MAX_CONTENT_LENGTH,
-            'port': cls.PORT,
-            'host': cls.HOST,
-            'debug': cls.DEBUG,
-            'log_level': cls.LOG_LEVEL,
-            'require_api_key': cls.REQUIRE_API_KEY,
-            'api_keys_configured': bool(cls.API_KEYS or os.path.exists(cls.API_KEYS_FILE))
-        }
\ No newline at end of file
+        """Convert configuration to a read-only dictionary (built once)."""
+        if cls._dict_cache is None:
+            cls._dict_cache = MappingProxyType({
+                'request_timeout': cls.REQUEST_TIMEOUT,
+                'max_retries': cls.MAX_RETRIES,
+                'rate_limit_delay': cls.RATE_LIMIT_DELAY,
+                'rate_limit_burst': cls.RATE_LIMIT_BURST,
+                'max_concurrent_scrapes': cls.MAX_CONCURRENT_SCRAPES,
+                'max_content_length': cls.MAX_CONTENT_LENGTH,
+                'port': cls.PORT,
+                'host': cls.HOST,
+                'debug': cls.DEBUG,
+                'log_level': cls.LOG_LEVEL,
+                'require_api_key': cls.REQUIRE_API_KEY,
+                'api_keys_configured': bool(cls.API_KEYS or os.path.exists(cls.API_KEYS_FILE))
+            })
+        return cls._dict_cache
\ No newline at end of file
@@ -6,11 +6,15 @@ import os
 import sys
 import argparse
 from datetime import datetime
-from auth import api_key_manager
+
+def _get_manager():
+    """Import auth lazily so --help doesn't load Flask or the key table."""
+    from auth import get_manager
+    return get_manager()
 
 def generate_key(name):
     """Generate a new API key."""
-    key = api_key_manager.generate_api_key(name)
+    key = _get_manager().generate_api_key(name)
     print(f"Generated new API key: {key}")
     print(f"Name: {name}")
     print(f"Created: {datetime.utcnow().isoformat()}")
@@ -19,7 +23,7 @@ def generate_key(name):
 
 def list_keys():
     """List all API keys."""
-    keys = api_key_manager.list_api_keys()
+    keys = _get_manager().list_api_keys()
     
     if not keys:
         print("No API keys found.")
@@ -37,7 +41,7 @@ def list_keys():
 
 def revoke_key(key):
     """Revoke an API key."""
-    success = api_key_manager.revoke_api_key(key)
+    success = _get_manager().revoke_api_key(key)
     
     if success:
         print(f"✅ API key revoked successfully: {key[:8]}...")
@@ -46,7 +50,7 @@ def revoke_key(key):
 
 def validate_key(key):
     """Validate an API key."""
-    key_info = api_key_manager.validate_api_key(key)
+    key_info = _get_manager().validate_api_key(key)
     
     if key_info:
         print(f"✅ API key is valid")
@@ -0,0 +1,48 @@
+"""
+Token bucket rate limiting for the scraper API.
+"""
+import math
+import threading
+import time
+from collections import defaultdict
+
+class TokenBucket:
+    """Per-client token bucket that refills continuously over time."""
+
+    def __init__(self, rate, capacity):
+        """
+        Args:
+            rate (float): Tokens added per second (<= 0 disables limiting)
+            capacity (float): Maximum number of tokens a client can hold
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        # key -> [tokens, last_refill_monotonic]
+        self._buckets = defaultdict(lambda: [self.capacity, time.monotonic()])
+
+    def try_acquire(self, key):
+        """
+        Take a single token for a client without blocking.
+
+        Args:
+            key (str): Client identifier (API key name or remote address)
+
+        Returns:
+            tuple: (allowed, retry_after_seconds)
+        """
+        if self.rate <= 0:
+            return True, 0
+
+        with self._lock:
+            bucket = self._buckets[key]
+            now = time.monotonic()
+            tokens = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+
+            if tokens >= 1:
+                bucket[0] = tokens - 1
+                return True, 0
+
+            bucket[0] = tokens
+            return False, max(1, math.ceil((1 - tokens) / self.rate))
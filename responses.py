@@ -0,0 +1,70 @@
+"""
+Fast JSON response helpers backed by orjson.
+"""
+import re
+import orjson
+from flask import Response
+from flask.json.provider import JSONProvider
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider that encodes and decodes with orjson."""
+    
+    def dumps(self, obj, **kwargs):
+        """
+        Serialize an object to a JSON string.
+        
+        Args:
+            obj: JSON-serializable object
+            
+        Returns:
+            str: JSON document
+        """
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    def loads(self, s, **kwargs):
+        """
+        Deserialize a JSON document.
+        
+        Args:
+            s (str | bytes): JSON document
+            
+        Returns:
+            Deserialized object
+        """
+        return orjson.loads(s)
+
+def ojsonify(payload, status=200, headers=None):
+    """
+    Serialize a payload into a JSON response using orjson.
+    
+    Args:
+        payload: JSON-serializable object
+        status (int): HTTP status code
+        headers (dict): Optional extra response headers
+        
+    Returns:
+        flask.Response: JSON response
+    """
+    return Response(
+        orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS),
+        status=status,
+        headers=headers,
+        mimetype='application/json'
+    )
+
+def json_template(payload):
+    """
+    Serialize a mostly-static payload once for cheap per-request filling.
+    
+    String values of the form '__name__' become %(name)s slots, so the
+    result can be completed with ``template % {b'name': b'...'}`` where each
+    value is already JSON-encoded bytes.
+    
+    Args:
+        payload (dict): Response payload containing placeholder values
+        
+    Returns:
+        bytes: Serialized JSON with named %-format slots
+    """
+    body = orjson.dumps(payload).replace(b'%', b'%%')
+    return re.sub(rb'"__(\w+)__"', rb'%(\1)s', body)
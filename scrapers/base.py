@@ -2,40 +2,377 @@
 Base scraper functionality shared across all scrapers.
 """
 import logging
+import socket
+import threading
+import lxml.html
+from lxml import etree
 import requests
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from timestamps import now_iso
+from functools import lru_cache
+import re
 import time
 
+# Pages declaring a charset in a <meta> tag are left to lxml's own detection
+_META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset', re.IGNORECASE)
+
 logger = logging.getLogger(__name__)
 
+# RFC 3986-style prefilter for absolute http(s) URLs, compiled once at import
+URL_PATTERN = re.compile(
+    r'^(https?)://([^/:?#\s]+)(:\d+)?(/[^\s?#]*)?(\?[^\s#]*)?(#\S*)?$',
+    re.IGNORECASE
+)
+
+# Surrounding whitespace and an optional scheme, split off in a single pass
+_NORMALIZE_PATTERN = re.compile(r'^\s*(?:(https?)://)?(.*?)\s*$', re.IGNORECASE | re.DOTALL)
+
+# Longest URL accepted; also bounds what the normalize cache can hold
+MAX_URL_LENGTH = 2048
+
+def normalize_url(url):
+    """
+    Strip a URL, lowercase or default its scheme and check it is well formed.
+    
+    Args:
+        url (str): Raw URL as submitted
+        
+    Returns:
+        tuple: (normalized_url, error_message)
+    """
+    # Checked before the cached call so oversized input is never kept
+    if len(url) > MAX_URL_LENGTH:
+        return None, f'URL too long (max: {MAX_URL_LENGTH} characters)'
+    
+    return _normalize_url_cached(url)
+
+@lru_cache(maxsize=4096)
+def _normalize_url_cached(url):
+    """
+    Memoized body of normalize_url for inputs within MAX_URL_LENGTH.
+    
+    Args:
+        url (str): Raw URL as submitted
+        
+    Returns:
+        tuple: (normalized_url, error_message)
+    """
+    match = _NORMALIZE_PATTERN.match(url)
+    rest = match.group(2)
+    if not rest:
+        return None, 'URL cannot be empty'
+    
+    url = (match.group(1) or 'https').lower() + '://' + rest
+    
+    if not URL_PATTERN.match(url):
+        return None, 'Malformed URL'
+    
+    return url, None
+
+# Resolver cache in front of socket.getaddrinfo
+_DNS_CACHE_TTL = 60
+_DNS_CACHE_SIZE = 1024
+_dns_cache = OrderedDict()
+_dns_lock = threading.Lock()
+_orig_getaddrinfo = socket.getaddrinfo
+
+def _cached_getaddrinfo(host, port, *args, **kwargs):
+    """
+    TTL'd LRU wrapper around socket.getaddrinfo.
+    
+    Repeated fetches from the same host skip the resolver for up to
+    _DNS_CACHE_TTL seconds.
+    """
+    key = (host, port, args, tuple(sorted(kwargs.items())))
+    now = time.monotonic()
+    
+    with _dns_lock:
+        entry = _dns_cache.get(key)
+        if entry and entry[0] > now:
+            _dns_cache.move_to_end(key)
+            return entry[1]
+    
+    result = _orig_getaddrinfo(host, port, *args, **kwargs)
+    
+    with _dns_lock:
+        _dns_cache[key] = (now + _DNS_CACHE_TTL, result)
+        _dns_cache.move_to_end(key)
+        while len(_dns_cache) > _DNS_CACHE_SIZE:
+            _dns_cache.popitem(last=False)
+    
+    return result
+
+# Install once, even if this module is reloaded
+if not getattr(socket.getaddrinfo, '_scraper_dns_cache', False):
+    _cached_getaddrinfo._scraper_dns_cache = True
+    socket.getaddrinfo = _cached_getaddrinfo
+
+# Connection pool shared by every scraper so keep-alive connections are reused
+_SHARED_SESSION = None
+
+# Seconds urllib3 sleeps between retries grow as factor * 2 ** (retry - 1)
+RETRY_BACKOFF_FACTOR = 0.2
+
+def fetch_time_budget(config):
+    """
+    Get the worst-case time one page fetch can spend across its retries.
+    
+    Args:
+        config: Configuration object providing REQUEST_TIMEOUT and MAX_RETRIES
+        
+    Returns:
+        float: Seconds for every attempt to time out plus the backoff between them
+    """
+    attempts = config.MAX_RETRIES + 1
+    backoff = sum(RETRY_BACKOFF_FACTOR * 2 ** (retry - 1) for retry in range(1, attempts))
+    return attempts * config.REQUEST_TIMEOUT + backoff
+
+def _get_shared_session(config):
+    """
+    Create (once) the pooled HTTP session shared across scrapers.
+    
+    Args:
+        config: Configuration object providing MAX_RETRIES
+        
+    Returns:
+        requests.Session: Shared session with tuned connection pools
+    """
+    global _SHARED_SESSION
+    
+    if _SHARED_SESSION is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=64,
+            pool_maxsize=128,
+            # Retry connection failures and transient statuses only: a read
+            # timeout means the site is slow, and retrying it would just
+            # multiply REQUEST_TIMEOUT. Retry-After is ignored so a site
+            # cannot make callers sleep for as long as it asks.
+            max_retries=Retry(
+                total=config.MAX_RETRIES,
+                read=False,
+                backoff_factor=RETRY_BACKOFF_FACTOR,
+                status_forcelist=[429, 502, 503, 504],
+                respect_retry_after_header=False
+            )
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            # Only advertise encodings urllib3 can decode (br needs brotli installed)
+            'Accept-Encoding': ACCEPT_ENCODING,
+            'Connection': 'keep-alive'
+        })
+        _SHARED_SESSION = session
+    
+    return _SHARED_SESSION
+
+def element_text(element):
+    """
+    Get the stripped text of an element and its descendants.
+    
+    Args:
+        element (lxml.html.HtmlElement): Element to read
+        
+    Returns:
+        str: Text fragments, each stripped, joined without separators
+    """
+    return ''.join(fragment.strip() for fragment in element.itertext())
+
+@lru_cache(maxsize=32)
+def _get_html_parser(encoding):
+    """
+    Get a shared HTML parser for an encoding, created on first use.
+    
+    Comments and processing instructions are dropped at parse time so the
+    extractors never have to walk past them.
+    
+    Args:
+        encoding (str): Document encoding, or None to let lxml detect it
+        
+    Returns:
+        lxml.html.HTMLParser: Reusable parser, or None if libxml2 does not
+        support the encoding
+    """
+    try:
+        return lxml.html.HTMLParser(encoding=encoding, remove_comments=True, remove_pis=True)
+    except LookupError:
+        return None
+
+class ContentTooLargeError(Exception):
+    """Raised when a page body exceeds the configured size limit."""
+    
+    def __init__(self, size, limit):
+        super().__init__(f'Content too large: {size} bytes (max: {limit})')
+        self.size = size
+        self.limit = limit
+
+# Chunk size used when streaming page bodies
+READ_CHUNK_SIZE = 64 * 1024
+
+# Default number of pages fetched at once by scrape_many
+SCRAPE_MANY_WORKERS = 16
+
+# Recent successful results reused by the per-page convenience views
+_RESULT_CACHE_TTL = 60
+_RESULT_CACHE_SIZE = 128
+
 class BaseScraper:
     """Base class for all scrapers with common functionality."""
     
     def __init__(self, config):
         self.config = config
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self.session = _get_shared_session(config)
+        self._result_cache = OrderedDict()
+        self._result_lock = threading.Lock()
     
-    def get_page_response(self, url):
+    def cached_scrape(self, url):
+        """
+        Scrape a URL, reusing a recent successful result for the same URL.
+        
+        Lets views such as summaries or filtered link lists share one fetch
+        and parse for up to _RESULT_CACHE_TTL seconds.
+        
+        Args:
+            url (str): The URL to scrape
+            
+        Returns:
+            dict: Scraping results; a copy the caller may modify
+        """
+        now = time.monotonic()
+        
+        with self._result_lock:
+            entry = self._result_cache.get(url)
+            if entry and entry[0] > now:
+                self._result_cache.move_to_end(url)
+                return dict(entry[1])
+        
+        result = self.scrape(url)
+        
+        if result['success']:
+            with self._result_lock:
+                self._result_cache[url] = (now + _RESULT_CACHE_TTL, result)
+                self._result_cache.move_to_end(url)
+                while len(self._result_cache) > _RESULT_CACHE_SIZE:
+                    self._result_cache.popitem(last=False)
+        
+        return dict(result)
+    
+    def scrape_many(self, urls, max_workers=SCRAPE_MANY_WORKERS):
+        """
+        Scrape several URLs concurrently over the shared session.
+        
+        Network waits overlap, so the batch takes about as long as its
+        slowest page rather than the sum of all of them.
+        
+        Args:
+            urls (list): URLs to scrape
+            max_workers (int): Maximum number of pages fetched at once
+            
+        Returns:
+            list: Scrape results in the same order as urls
+        """
+        urls = list(urls)
+        if not urls:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+            return list(executor.map(self.scrape, urls))
+    
+    def get_page_response(self, url, max_bytes=None):
         """
         Get HTTP response for a URL with proper error handling.
         
         Args:
             url (str): URL to fetch
+            max_bytes (int): Optional limit on the body size; the download is
+                abandoned as soon as it is exceeded
             
         Returns:
-            requests.Response: HTTP response object
+            requests.Response: HTTP response object with its body read
             
         Raises:
             requests.exceptions.RequestException: For HTTP errors
+            ContentTooLargeError: If the body is larger than max_bytes
         """
-        logger.info(f"Fetching URL: {url}")
-        response = self.session.get(url, timeout=self.config.REQUEST_TIMEOUT)
-        response.raise_for_status()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Fetching URL: {url}")
+        response = self.session.get(url, timeout=self.config.REQUEST_TIMEOUT, stream=True)
+        
+        try:
+            response.raise_for_status()
+            
+            if max_bytes is None:
+                # Read the whole body before the connection is released
+                response.content
+            else:
+                response._content = self._read_body(response, max_bytes)
+        finally:
+            # Returns the connection to the pool, or drops it if the body was cut short
+            response.close()
+        
         return response
     
+    def _read_body(self, response, max_bytes):
+        """
+        Read a streamed response body, stopping once it exceeds a limit.
+        
+        Args:
+            response (requests.Response): Response opened with stream=True
+            max_bytes (int): Maximum body size in bytes
+            
+        Returns:
+            bytes: Response body
+            
+        Raises:
+            ContentTooLargeError: If the body is larger than max_bytes
+        """
+        # Reject declared oversize bodies without reading any of them
+        declared = response.headers.get('Content-Length', '')
+        if declared.isdigit() and int(declared) > max_bytes:
+            raise ContentTooLargeError(int(declared), max_bytes)
+        
+        body = bytearray()
+        for chunk in response.iter_content(chunk_size=READ_CHUNK_SIZE):
+            body += chunk
+            if len(body) > max_bytes:
+                raise ContentTooLargeError(len(body), max_bytes)
+        
+        return bytes(body)
+    
+    def parse_html(self, response):
+        """
+        Parse an HTTP response body into an lxml HTML tree.
+        
+        Args:
+            response (requests.Response): Fetched page
+            
+        Returns:
+            lxml.html.HtmlElement: Root element of the parsed page
+        """
+        content = response.content
+        parser = None
+        
+        # libxml2 falls back to Latin-1 for undeclared bytes, so use the
+        # header charset when libxml2 knows it and otherwise UTF-8 unless
+        # the page declares its own charset
+        if 'charset' in response.headers.get('Content-Type', '').lower():
+            parser = _get_html_parser(response.encoding)
+        if parser is None:
+            declared = _META_CHARSET_PATTERN.search(content[:2048])
+            parser = _get_html_parser(None if declared else 'utf-8')
+        
+        try:
+            return lxml.html.fromstring(content, parser=parser)
+        except etree.ParserError:
+            # Empty or whitespace-only bodies are an empty page, not a failure
+            return lxml.html.fromstring('<html></html>')
+    
     def create_error_response(self, error_msg, start_time=None):
         """
         Create a standardized error response.
@@ -52,7 +389,7 @@ class BaseScraper:
         return {
             'success': False,
             'processing_time': round(processing_time, 2),
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': now_iso(),
             'error': error_msg
         }
     
@@ -93,9 +430,4 @@ class BaseScraper:
         if not url:
             return None, 'URL cannot be empty'
         
-        url = url.strip()
-        
-        if not url.startswith(('http://', 'https://')):
-            url = 'https://' + url
-        
-        return url, None
\ No newline at end of file
+        return normalize_url(url)
\ No newline at end of file
@@ -0,0 +1,98 @@
+"""
+Combined scraper that extracts URLs and text from a single page fetch.
+"""
+import logging
+import time
+from timestamps import now_iso
+from .base import BaseScraper, ContentTooLargeError
+from .text_scraper import TextScraper
+from .url_scraper import URLScraper
+
+logger = logging.getLogger(__name__)
+
+class CombinedScraper(BaseScraper):
+    """Scraper that runs URL and text extraction over one HTTP response."""
+    
+    def __init__(self, config):
+        super().__init__(config)
+        self.url_scraper = URLScraper(config)
+        self.text_scraper = TextScraper(config)
+    
+    def scrape(self, url):
+        """
+        Extract hyperlinks and text content from a given URL with one fetch.
+        
+        Args:
+            url (str): The URL to scrape
+        
+        Returns:
+            dict: Dictionary containing the URL and text scraping fields
+        """
+        start_time = time.time()
+        
+        try:
+            # Validate URL
+            url, error = self.validate_url(url)
+            if error:
+                return self._create_empty_response(error, start_time)
+            
+            # Get page response once for both extractors
+            response = self.get_page_response(url, max_bytes=self.config.MAX_CONTENT_LENGTH)
+            
+            # Parse once; link extraction only reads the tree, so it must run
+            # before text extraction strips unwanted elements from it
+            tree = self.parse_html(response)
+            url_result = self.url_scraper.parse(response, url, start_time, tree=tree)
+            text_result = self.text_scraper.parse(response, url, start_time, tree=tree)
+            
+            if not text_result['success']:
+                return self._create_empty_response(text_result['error'], start_time)
+            
+            return {
+                'success': True,
+                'urls': url_result['urls'],
+                'count': url_result['count'],
+                'text': text_result['text'],
+                'title': text_result['title'],
+                'meta_description': text_result['meta_description'],
+                'headings': text_result['headings'],
+                'word_count': text_result['word_count'],
+                'character_count': text_result['character_count'],
+                'processing_time': round(time.time() - start_time, 2),
+                'timestamp': now_iso(),
+                'error': None
+            }
+        
+        except ContentTooLargeError as e:
+            logger.warning(f"Content length exceeds limit for {url}")
+            return self._create_empty_response(str(e), start_time)
+        
+        except Exception as e:
+            logger.error(f"Error scraping {url}: {str(e)}")
+            return self.handle_request_errors(url, e, start_time)
+    
+    def _create_empty_response(self, error_msg, start_time):
+        """
+        Create an empty response for combined scraping errors.
+        
+        Args:
+            error_msg (str): Error message
+            start_time (float): Start time
+        
+        Returns:
+            dict: Empty response with error
+        """
+        return {
+            'success': False,
+            'urls': [],
+            'count': 0,
+            'text': '',
+            'title': '',
+            'meta_description': '',
+            'headings': {},
+            'word_count': 0,
+            'character_count': 0,
+            'processing_time': round(time.time() - start_time, 2),
+            'timestamp': now_iso(),
+            'error': error_msg
+        }
@@ -4,12 +4,49 @@ Text scraper for extracting clean text content from webpages.
 import logging
 import time
 import re
-from datetime import datetime
-from bs4 import BeautifulSoup
-from .base import BaseScraper
+from itertools import islice
+from timestamps import now_iso
+from lxml import etree
+from .base import BaseScraper, ContentTooLargeError
 
 logger = logging.getLogger(__name__)
 
+# Elements dropped wholesale before extracting text
+UNWANTED_TAGS = ('script', 'style', 'nav', 'header', 'footer', 'aside')
+
+# Class/id fragments that mark an element as navigation/layout chrome
+UNWANTED_WORDS = ('nav', 'menu', 'sidebar', 'footer', 'header')
+
+# Open Graph properties used as title/description fallbacks
+_OG_PROPERTIES = ('og:title', 'og:description')
+
+# Whitespace other than a plain space that str.split() breaks on
+_WHITESPACE_BREAKS = tuple(ch for ch in map(chr, range(0x3001)) if ch.isspace() and ch != ' ')
+_ASCII_WHITESPACE_BREAKS = tuple(ch for ch in _WHITESPACE_BREAKS if ch.isascii())
+
+# One sentence used to build page summaries: from its first visible character
+# up to the next terminator
+_SENTENCE_PATTERN = re.compile(r'[^.!?\s][^.!?]*')
+
+# Heading levels reported in the scrape result
+HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+
+def _is_unwanted(element):
+    """
+    Check whether an element's class or id marks it as page chrome.
+    
+    Args:
+        element (lxml.html.HtmlElement): Element to check
+        
+    Returns:
+        bool: True if the element should be skipped
+    """
+    for attr in ('class', 'id'):
+        value = element.get(attr)
+        if value and any(word in value for word in UNWANTED_WORDS):
+            return True
+    return False
+
 class TextScraper(BaseScraper):
     """Scraper for extracting text content from webpages."""
     
@@ -32,190 +69,170 @@ class TextScraper(BaseScraper):
                 return self._create_empty_response(error, start_time)
             
             # Get page response
-            response = self.get_page_response(url)
-            
-            # Check content length
-            if len(response.content) > self.config.MAX_CONTENT_LENGTH:
-                error_msg = f'Content too large: {len(response.content)} bytes (max: {self.config.MAX_CONTENT_LENGTH})'
-                logger.warning(f"Content length exceeds limit for {url}")
-                return self._create_empty_response(error_msg, start_time)
-            
-            # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract text and metadata
-            text_data = self._extract_text_content(soup)
+            response = self.get_page_response(url, max_bytes=self.config.MAX_CONTENT_LENGTH)
             
-            processing_time = time.time() - start_time
-            logger.info(f"Successfully scraped {text_data['word_count']} words in {processing_time:.2f}s")
+            return self.parse(response, url, start_time)
             
-            return {
-                'success': True,
-                'text': text_data['text'],
-                'title': text_data['title'],
-                'meta_description': text_data['meta_description'],
-                'headings': text_data['headings'],
-                'word_count': text_data['word_count'],
-                'character_count': text_data['character_count'],
-                'processing_time': round(processing_time, 2),
-                'timestamp': datetime.utcnow().isoformat(),
-                'error': None
-            }
+        except ContentTooLargeError as e:
+            logger.warning(f"Content length exceeds limit for {url}")
+            return self._create_empty_response(str(e), start_time)
             
         except Exception as e:
             logger.error(f"Error scraping text from {url}: {str(e)}")
             return self.handle_request_errors(url, e, start_time)
     
-    def _extract_text_content(self, soup):
+    def parse(self, response, url, start_time, tree=None):
         """
-        Extract and clean text content from HTML.
+        Extract text content from an already fetched page.
         
         Args:
-            soup (BeautifulSoup): Parsed HTML
+            response (requests.Response): Fetched page
+            url (str): URL the page was fetched from
+            start_time (float): Start time for processing calculation
+            tree (lxml.html.HtmlElement): Optional already parsed page (modified in place)
             
         Returns:
-            dict: Extracted text data
+            dict: Dictionary containing success status, text content, and metadata
         """
-        # Remove unwanted elements
-        self._remove_unwanted_elements(soup)
+        # Check content length
+        if len(response.content) > self.config.MAX_CONTENT_LENGTH:
+            error_msg = f'Content too large: {len(response.content)} bytes (max: {self.config.MAX_CONTENT_LENGTH})'
+            logger.warning(f"Content length exceeds limit for {url}")
+            return self._create_empty_response(error_msg, start_time)
         
-        # Extract main text
-        text = soup.get_text()
-        cleaned_text = self._clean_text(text)
+        # Parse HTML
+        if tree is None:
+            tree = self.parse_html(response)
         
-        # Extract metadata
-        title = self._extract_title(soup)
-        meta_description = self._extract_meta_description(soup)
-        headings = self._extract_headings(soup)
+        # Extract text and metadata
+        text_data = self._extract_text_content(tree)
+        
+        processing_time = time.time() - start_time
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Successfully scraped {text_data['word_count']} words in {processing_time:.2f}s")
         
         return {
-            'text': cleaned_text,
-            'title': title,
-            'meta_description': meta_description,
-            'headings': headings,
-            'word_count': len(cleaned_text.split()),
-            'character_count': len(cleaned_text)
+            'success': True,
+            'text': text_data['text'],
+            'title': text_data['title'],
+            'meta_description': text_data['meta_description'],
+            'headings': text_data['headings'],
+            'word_count': text_data['word_count'],
+            'character_count': text_data['character_count'],
+            'processing_time': round(processing_time, 2),
+            'timestamp': now_iso(),
+            'error': None
         }
     
-    def _remove_unwanted_elements(self, soup):
-        """
-        Remove script, style, and navigation elements.
-        
-        Args:
-            soup (BeautifulSoup): Parsed HTML to modify
-        """
-        # Remove script and style elements
-        for element in soup(["script", "style"]):
-            element.decompose()
-        
-        # Remove navigation and structural elements
-        for element in soup(["nav", "header", "footer", "aside"]):
-            element.decompose()
-        
-        # Remove common unwanted classes and IDs
-        unwanted_selectors = [
-            '[class*="nav"]',
-            '[class*="menu"]',
-            '[class*="sidebar"]',
-            '[class*="footer"]',
-            '[class*="header"]',
-            '[id*="nav"]',
-            '[id*="menu"]',
-            '[id*="sidebar"]',
-            '[id*="footer"]',
-            '[id*="header"]'
-        ]
-        
-        for selector in unwanted_selectors:
-            for element in soup.select(selector):
-                element.decompose()
-    
-    def _clean_text(self, text):
+    def _extract_text_content(self, tree):
         """
-        Clean and normalize text content.
+        Extract and clean text content from HTML.
         
         Args:
-            text (str): Raw text to clean
+            tree (lxml.html.HtmlElement): Parsed HTML
             
         Returns:
-            str: Cleaned text
+            dict: Extracted text data
         """
-        # Remove extra whitespace and normalize line breaks
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        cleaned = ' '.join(chunk for chunk in chunks if chunk)
+        # Remove script, style, navigation and structural elements
+        etree.strip_elements(tree, *UNWANTED_TAGS, with_tail=False)
         
-        # Remove excessive whitespace
-        cleaned = re.sub(r'\s+', ' ', cleaned)
+        # Collect text, title, meta description and headings in one walk
+        walked = self._walk_tree(tree)
+        cleaned_text = self._clean_text(''.join(walked['chunks']))
         
-        return cleaned.strip()
+        return {
+            'text': cleaned_text,
+            'title': walked['title'],
+            'meta_description': walked['meta_description'],
+            'headings': walked['headings'],
+            'word_count': len(cleaned_text.split()),
+            'character_count': len(cleaned_text)
+        }
     
-    def _extract_title(self, soup):
+    def _walk_tree(self, tree):
         """
-        Extract page title.
+        Walk the parsed page once, skipping elements whose class or id marks
+        them as navigation/layout chrome.
         
         Args:
-            soup (BeautifulSoup): Parsed HTML
+            tree (lxml.html.HtmlElement): Parsed HTML with unwanted tags stripped
             
         Returns:
-            str: Page title
-        """
-        title = soup.find('title')
-        if title:
-            return title.get_text(strip=True)
-        
-        # Try alternative title sources
-        og_title = soup.find('meta', attrs={'property': 'og:title'})
-        if og_title:
-            return og_title.get('content', '')
-        
-        # Try h1 as fallback
-        h1 = soup.find('h1')
-        if h1:
-            return h1.get_text(strip=True)
-        
-        return ""
-    
-    def _extract_meta_description(self, soup):
+            dict: Text chunks, title, meta description and headings
         """
-        Extract meta description.
+        chunks = []
+        headings = {tag: [] for tag in HEADING_TAGS}
+        meta = {}
+        title = None
+        # Elements whose text is being captured -> index of their first chunk
+        marks = {}
         
-        Args:
-            soup (BeautifulSoup): Parsed HTML
+        walker = etree.iterwalk(tree, events=('start', 'end', 'comment', 'pi'))
+        for event, element in walker:
+            tag = element.tag
             
-        Returns:
-            str: Meta description
-        """
-        # Try standard meta description
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
-        if meta_desc:
-            return meta_desc.get('content', '')
+            if event == 'start':
+                if _is_unwanted(element):
+                    walker.skip_subtree()
+                    continue
+                
+                if tag in headings or (tag == 'title' and title is None):
+                    marks[element] = len(chunks)
+                elif tag == 'meta':
+                    if element.get('name') == 'description':
+                        meta.setdefault('description', element.get('content', ''))
+                    prop = element.get('property')
+                    if prop in _OG_PROPERTIES:
+                        meta.setdefault(prop, element.get('content', ''))
+                
+                if element.text:
+                    chunks.append(element.text)
+                continue
+            
+            if event == 'end' and element in marks:
+                text = ''.join(chunk.strip() for chunk in chunks[marks.pop(element):])
+                if tag == 'title':
+                    title = text
+                else:
+                    headings[tag].append(text)
+            
+            # Tails follow the element; comments and processing instructions only
+            # contribute their tail
+            if element.tail and element is not tree:
+                chunks.append(element.tail)
         
-        # Try Open Graph description
-        og_desc = soup.find('meta', attrs={'property': 'og:description'})
-        if og_desc:
-            return og_desc.get('content', '')
+        # Fall back to the Open Graph title, then the first h1
+        if title is None:
+            title = meta.get('og:title', headings['h1'][0] if headings['h1'] else '')
+        meta_description = meta.get('description', meta.get('og:description', ''))
         
-        return ""
+        return {
+            'chunks': chunks,
+            'title': title,
+            'meta_description': meta_description,
+            'headings': headings
+        }
     
-    def _extract_headings(self, soup):
+    def _clean_text(self, text):
         """
-        Extract heading structure.
+        Clean and normalize text content.
         
         Args:
-            soup (BeautifulSoup): Parsed HTML
+            text (str): Raw text to clean
             
         Returns:
-            dict: Headings organized by level
+            str: Cleaned text
         """
-        return {
-            'h1': [h.get_text(strip=True) for h in soup.find_all('h1')],
-            'h2': [h.get_text(strip=True) for h in soup.find_all('h2')],
-            'h3': [h.get_text(strip=True) for h in soup.find_all('h3')],
-            'h4': [h.get_text(strip=True) for h in soup.find_all('h4')],
-            'h5': [h.get_text(strip=True) for h in soup.find_all('h5')],
-            'h6': [h.get_text(strip=True) for h in soup.find_all('h6')]
-        }
+        # Already single-spaced text needs no new string; plain substring
+        # checks are much cheaper than the split/join they skip
+        if '  ' not in text and text[:1] != ' ' and text[-1:] != ' ':
+            breaks = _ASCII_WHITESPACE_BREAKS if text.isascii() else _WHITESPACE_BREAKS
+            if not any(ch in text for ch in breaks):
+                return text
+        
+        # Collapse every whitespace run (including line breaks) to one space
+        return ' '.join(text.split())
     
     def _create_empty_response(self, error_msg, start_time):
         """
@@ -237,7 +254,7 @@ class TextScraper(BaseScraper):
             'word_count': 0,
             'character_count': 0,
             'processing_time': round(time.time() - start_time, 2),
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': now_iso(),
             'error': error_msg
         }
     
@@ -252,20 +269,22 @@ class TextScraper(BaseScraper):
         Returns:
             dict: Scraping results with summary
         """
-        result = self.scrape(url)
+        result = self.cached_scrape(url)
         
         if result['success'] and result['text']:
-            # Simple sentence extraction
-            sentences = re.split(r'[.!?]+', result['text'])
-            sentences = [s.strip() for s in sentences if s.strip()]
+            # Simple sentence extraction: only the summary sentences are kept,
+            # the rest of the page is just counted
+            matches = _SENTENCE_PATTERN.finditer(result['text'])
+            sentences = [match.group().rstrip() for match in islice(matches, max(max_sentences, 0))]
+            total_sentences = len(sentences) + sum(1 for _ in matches)
             
             # Take first few sentences as summary
-            summary = '. '.join(sentences[:max_sentences])
+            summary = '. '.join(sentences)
             if summary and not summary.endswith('.'):
                 summary += '.'
             
             result['summary'] = summary
-            result['total_sentences'] = len(sentences)
+            result['total_sentences'] = total_sentences
         
         return result
     
@@ -279,7 +298,7 @@ class TextScraper(BaseScraper):
         Returns:
             dict: Scraping results with main content focus
         """
-        result = self.scrape(url)
+        result = self.cached_scrape(url)
         
         if result['success']:
             # Additional processing could be added here
@@ -3,13 +3,26 @@ URL scraper for extracting hyperlinks from webpages.
 """
 import logging
 import time
-from datetime import datetime
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
-from .base import BaseScraper
+from timestamps import now_iso
+from urllib.parse import urljoin, urlparse
+from .base import BaseScraper, element_text
 
 logger = logging.getLogger(__name__)
 
+# hrefs starting with one of these are already absolute
+ABSOLUTE_PREFIXES = ('http://', 'https://', 'mailto:', 'tel:', 'ftp://')
+
+# Link types identified by URL scheme
+LINK_SCHEMES = {
+    'mailto': 'email',
+    'tel': 'phone',
+    'ftp': 'ftp',
+    'javascript': 'javascript'
+}
+
+# Extensions reported as downloadable files
+FILE_EXTENSIONS = ('.pdf', '.doc', '.docx', '.xls', '.xlsx', '.zip', '.rar')
+
 class URLScraper(BaseScraper):
     """Scraper for extracting URLs from webpages."""
     
@@ -34,84 +47,101 @@ class URLScraper(BaseScraper):
             # Get page response
             response = self.get_page_response(url)
             
-            # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract links
-            links = self._extract_links(soup, url)
-            
-            processing_time = time.time() - start_time
-            logger.info(f"Successfully scraped {len(links)} URLs in {processing_time:.2f}s")
-            
-            return {
-                'success': True,
-                'urls': links,
-                'count': len(links),
-                'processing_time': round(processing_time, 2),
-                'timestamp': datetime.utcnow().isoformat(),
-                'error': None
-            }
+            return self.parse(response, url, start_time)
             
         except Exception as e:
             logger.error(f"Error scraping URLs from {url}: {str(e)}")
             return self.handle_request_errors(url, e, start_time)
     
-    def _extract_links(self, soup, base_url):
+    def parse(self, response, url, start_time, tree=None):
+        """
+        Extract hyperlinks from an already fetched page.
+        
+        Args:
+            response (requests.Response): Fetched page
+            url (str): URL the page was fetched from
+            start_time (float): Start time for processing calculation
+            tree (lxml.html.HtmlElement): Optional already parsed page (left unmodified)
+            
+        Returns:
+            dict: Dictionary containing success status, URLs list, and metadata
+        """
+        # Parse HTML
+        if tree is None:
+            tree = self.parse_html(response)
+        
+        # Extract links
+        links = self._extract_links(tree, url)
+        
+        processing_time = time.time() - start_time
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Successfully scraped {len(links)} URLs in {processing_time:.2f}s")
+        
+        return {
+            'success': True,
+            'urls': links,
+            'count': len(links),
+            'processing_time': round(processing_time, 2),
+            'timestamp': now_iso(),
+            'error': None
+        }
+    
+    def _extract_links(self, tree, base_url):
         """
         Extract all anchor tags and convert to link objects.
         
         Args:
-            soup (BeautifulSoup): Parsed HTML
+            tree (lxml.html.HtmlElement): Parsed HTML
             base_url (str): Base URL for resolving relative links
             
         Returns:
             list: List of link objects
         """
         links = []
+        append = links.append
+        base_domain = urlparse(base_url).netloc
         
-        for i, anchor in enumerate(soup.find_all('a', href=True)):
-            href = anchor['href']
+        for i, anchor in enumerate(tree.xpath('//a[@href]'), 1):
+            href = anchor.get('href')
             full_url = urljoin(base_url, href)
-            link_text = anchor.get_text(strip=True)
+            link_text = element_text(anchor)
             
             # Determine if link is relative
-            is_relative = not href.startswith(('http://', 'https://', 'mailto:', 'tel:', 'ftp://'))
+            is_relative = not href.startswith(ABSOLUTE_PREFIXES)
             
             # Get additional link attributes
             link_title = anchor.get('title', '')
-            link_class = ' '.join(anchor.get('class', []))
+            # Most anchors have no class; only normalize spacing when there is one
+            link_class = anchor.get('class')
+            link_class = ' '.join(link_class.split()) if link_class else ''
             
-            link_obj = {
-                'id': i + 1,
+            append({
+                'id': i,
                 'url': full_url,
                 'original_href': href,
                 'text': link_text,
                 'title': link_title,
                 'class': link_class,
                 'is_relative': is_relative,
-                'is_external': self._is_external_link(full_url, base_url),
+                'is_external': self._is_external_link(full_url, base_domain),
                 'link_type': self._get_link_type(href)
-            }
-            
-            links.append(link_obj)
+            })
         
         return links
     
-    def _is_external_link(self, link_url, base_url):
+    def _is_external_link(self, link_url, base_domain):
         """
         Check if a link is external (different domain).
         
         Args:
             link_url (str): The link URL
-            base_url (str): The base URL
+            base_domain (str): Network location of the page being scraped
             
         Returns:
             bool: True if external link
         """
         try:
-            from urllib.parse import urlparse
             link_domain = urlparse(link_url).netloc
-            base_domain = urlparse(base_url).netloc
             return link_domain != base_domain and link_domain != ''
         except:
             return False
@@ -126,20 +156,16 @@ class URLScraper(BaseScraper):
         Returns:
             str: Link type (web, email, phone, file, etc.)
         """
-        if href.startswith('mailto:'):
-            return 'email'
-        elif href.startswith('tel:'):
-            return 'phone'
-        elif href.startswith('ftp:'):
-            return 'ftp'
-        elif href.startswith('#'):
+        if href.startswith('#'):
             return 'anchor'
-        elif href.startswith('javascript:'):
-            return 'javascript'
-        elif any(href.lower().endswith(ext) for ext in ['.pdf', '.doc', '.docx', '.xls', '.xlsx', '.zip', '.rar']):
-            return 'file'
-        else:
-            return 'web'
+        
+        scheme, colon, _ = href.partition(':')
+        if colon:
+            link_type = LINK_SCHEMES.get(scheme.lower())
+            if link_type:
+                return link_type
+        
+        return 'file' if href.lower().endswith(FILE_EXTENSIONS) else 'web'
     
     def _create_empty_response(self, error_msg, start_time):
         """
@@ -157,7 +183,7 @@ class URLScraper(BaseScraper):
             'urls': [],
             'count': 0,
             'processing_time': round(time.time() - start_time, 2),
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': now_iso(),
             'error': error_msg
         }
     
@@ -172,7 +198,7 @@ class URLScraper(BaseScraper):
         Returns:
             dict: Filtered scraping results
         """
-        result = self.scrape(url)
+        result = self.cached_scrape(url)
         
         if result['success']:
             filtered_urls = [
@@ -195,7 +221,7 @@ class URLScraper(BaseScraper):
         Returns:
             dict: Scraping results with only external links
         """
-        result = self.scrape(url)
+        result = self.cached_scrape(url)
         
         if result['success']:
             external_urls = [
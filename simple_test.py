@@ -2,49 +2,20 @@
 """
 Simple local test for the unified scraper API.
 """
-import subprocess
-import time
-import requests
-import json
-import threading
-import sys
-from datetime import datetime
 
-def start_server():
-    """Start the Flask server in a separate thread."""
-    try:
-        subprocess.run([sys.executable, "app.py"], cwd=".", check=True)
-    except KeyboardInterrupt:
-        print("Server stopped.")
-
-def test_api_endpoints():
-    """Test API endpoints once server is running."""
-    base_url = "http://localhost:5000"
+def run_api_checks(client):
+    """Test API endpoints against the in-process app."""
     api_key = "dev-key-12345"  # Default development key
     
     print("Testing Unified Scraper API Locally")
     print(f"Using API Key: {api_key}")
     print("=" * 60)
     
-    # Wait for server to start
-    print("Waiting for server to start...")
-    for i in range(30):
-        try:
-            response = requests.get(f"{base_url}/health", timeout=2)
-            if response.status_code == 200:
-                print("Server is running!")
-                break
-        except:
-            time.sleep(1)
-    else:
-        print("Server failed to start within 30 seconds")
-        return False
-    
     # Test 1: Health check
     print("\n1. Health Check:")
     try:
-        response = requests.get(f"{base_url}/health")
-        health = response.json()
+        response = client.get("/health")
+        health = response.get_json()
         print(f"   Status: {health.get('status', 'unknown')}")
         print(f"   Service: {health.get('service', 'unknown')}")
         print(f"   Authenticated: {health.get('authenticated', False)}")
@@ -55,8 +26,8 @@ def test_api_endpoints():
     # Test 2: Service info
     print("\n2. Service Information:")
     try:
-        response = requests.get(f"{base_url}/api/info")
-        info = response.json()
+        response = client.get("/api/info")
+        info = response.get_json()
         print(f"   Service: {info.get('service', 'unknown')}")
         print(f"   Version: {info.get('version', 'unknown')}")
         print(f"   Endpoints: {len(info.get('endpoints', {}))}")
@@ -67,12 +38,12 @@ def test_api_endpoints():
     # Test 3: URL scraping without API key (should fail)
     print("\n3. URL Scraping (without API key - should fail):")
     try:
-        response = requests.post(
-            f"{base_url}/api/scrape/urls",
+        response = client.post(
+            "/api/scrape/urls",
             json={"url": "https://example.com"},
             headers={"Content-Type": "application/json"}
         )
-        result = response.json()
+        result = response.get_json()
         if result.get('success'):
             print("   ERROR: SECURITY ISSUE - Request succeeded without API key!")
         else:
@@ -84,15 +55,15 @@ def test_api_endpoints():
     # Test 4: URL scraping with API key
     print("\n4. URL Scraping (with API key):")
     try:
-        response = requests.post(
-            f"{base_url}/api/scrape/urls",
+        response = client.post(
+            "/api/scrape/urls",
             json={"url": "https://example.com"},
             headers={
                 "Content-Type": "application/json",
                 "X-API-Key": api_key
             }
         )
-        result = response.json()
+        result = response.get_json()
         if result.get('success'):
             print(f"   SUCCESS: Found {result.get('count', 0)} URLs")
             print(f"   Processing Time: {result.get('processing_time', 0)}s")
@@ -109,15 +80,15 @@ def test_api_endpoints():
     # Test 5: Text scraping with API key
     print("\n5. Text Scraping (with API key):")
     try:
-        response = requests.post(
-            f"{base_url}/api/scrape/text",
+        response = client.post(
+            "/api/scrape/text",
             json={"url": "https://example.com"},
             headers={
                 "Content-Type": "application/json",
                 "X-API-Key": api_key
             }
         )
-        result = response.json()
+        result = response.get_json()
         if result.get('success'):
             print(f"   SUCCESS: Extracted text content")
             print(f"   Title: {result.get('title', 'No title')}")
@@ -142,13 +113,12 @@ def main():
     print("Starting Local API Testing")
     print("=" * 60)
     
-    # Start server in background thread
-    server_thread = threading.Thread(target=start_server, daemon=True)
-    server_thread.start()
+    # Imported here so collecting this module does not monkey-patch gevent
+    from app import app
     
-    # Run tests
+    # Run tests through Flask's test client, no server process needed
     try:
-        success = test_api_endpoints()
+        success = run_api_checks(app.test_client())
         if success:
             print("\nAll tests passed! Service is ready for deployment.")
         else:
@@ -157,15 +127,6 @@ def main():
         print("\nTests interrupted by user.")
     except Exception as e:
         print(f"\nTesting failed: {e}")
-    
-    print("\nPress Ctrl+C to stop the server and exit.")
-    
-    # Keep main thread alive
-    try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        print("\nGoodbye!")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,5 +1,5 @@
 import requests
-import json
+import orjson
 import time
 
 class ScraperAPIClient:
@@ -19,7 +19,7 @@ class ScraperAPIClient:
                 json={"url": url},
                 headers=self.headers
             )
-            return response.json()
+            return orjson.loads(response.content)
         except Exception as e:
             return {"success": False, "error": f"API call failed: {str(e)}"}
     
@@ -31,7 +31,7 @@ class ScraperAPIClient:
                 json={"url": url},
                 headers=self.headers
             )
-            return response.json()
+            return orjson.loads(response.content)
         except Exception as e:
             return {"success": False, "error": f"API call failed: {str(e)}"}
     
@@ -39,7 +39,7 @@ class ScraperAPIClient:
         """Check API health."""
         try:
             response = requests.get(f"{self.base_url}/health")
-            return response.json()
+            return orjson.loads(response.content)
         except Exception as e:
             return {"status": "error", "error": f"Health check failed: {str(e)}"}
     
@@ -47,7 +47,7 @@ class ScraperAPIClient:
         """Get service information."""
         try:
             response = requests.get(f"{self.base_url}/api/info")
-            return response.json()
+            return orjson.loads(response.content)
         except Exception as e:
             return {"service": "unknown", "error": f"Info request failed: {str(e)}"}
 
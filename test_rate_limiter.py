@@ -0,0 +1,65 @@
+"""
+Unit tests for the token bucket rate limiter.
+"""
+import pytest
+import rate_limiter
+from rate_limiter import TokenBucket
+
+class FakeClock:
+    """Controllable stand-in for time.monotonic."""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, 'monotonic', fake)
+    return fake
+
+def test_burst_then_limited(clock):
+    bucket = TokenBucket(rate=1.0, capacity=3)
+    
+    assert [bucket.try_acquire('a')[0] for _ in range(3)] == [True, True, True]
+    assert bucket.try_acquire('a') == (False, 1)
+
+def test_refill_over_time(clock):
+    bucket = TokenBucket(rate=2.0, capacity=2)
+    bucket.try_acquire('a')
+    bucket.try_acquire('a')
+    assert not bucket.try_acquire('a')[0]
+    
+    clock.now += 0.5
+    assert bucket.try_acquire('a') == (True, 0)
+    assert not bucket.try_acquire('a')[0]
+
+def test_refill_capped_at_capacity(clock):
+    bucket = TokenBucket(rate=1.0, capacity=2)
+    bucket.try_acquire('a')
+    
+    clock.now += 60
+    assert [bucket.try_acquire('a')[0] for _ in range(3)] == [True, True, False]
+
+def test_retry_after_rounds_up(clock):
+    bucket = TokenBucket(rate=0.1, capacity=1)
+    bucket.try_acquire('a')
+    
+    assert bucket.try_acquire('a') == (False, 10)
+    clock.now += 4
+    assert bucket.try_acquire('a') == (False, 6)
+
+def test_clients_have_separate_buckets(clock):
+    bucket = TokenBucket(rate=1.0, capacity=1)
+    
+    assert bucket.try_acquire('a')[0]
+    assert not bucket.try_acquire('a')[0]
+    assert bucket.try_acquire('b')[0]
+
+@pytest.mark.parametrize('rate', [0, -1])
+def test_non_positive_rate_disables_limiting(clock, rate):
+    bucket = TokenBucket(rate=rate, capacity=1)
+    
+    assert all(bucket.try_acquire('a') == (True, 0) for _ in range(100))
\ No newline at end of file
@@ -0,0 +1,25 @@
+"""
+Cached timestamp helpers for response payloads.
+"""
+import time
+from datetime import datetime
+
+# (epoch_second, iso_string) swapped atomically once per second
+_cached = (0, '')
+
+def now_iso():
+    """
+    Get the current UTC time as an ISO 8601 string, second precision.
+    
+    The formatted string is reused for every call within the same second.
+    
+    Returns:
+        str: ISO formatted UTC timestamp
+    """
+    global _cached
+    
+    t = int(time.time())
+    if t != _cached[0]:
+        _cached = (t, datetime.utcfromtimestamp(t).isoformat())
+    
+    return _cached[1]